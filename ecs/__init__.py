@@ -1,7 +1,7 @@
-from ecs.component import Component
+from ecs.component import Component, TagComponent
 from ecs.world import World
 from ecs.event import Event
 from ecs.system import System
 
 
-__all__ = ["Component", "World", "Event", "System"]
+__all__ = ["Component", "TagComponent", "World", "Event", "System"]
@@ -1,42 +1,90 @@
+import sys
 from typing import Union
+
 import numpy as np
 
 
 class ArrayWrapper:
     """Wraps np.ndarray to provide a stable reference when the array reference changes.
 
-    A stable wrapper around a NumPy array that forwards most operations
-    (including arithmetic, bitwise, comparisons, and matrix multiplication)
-    to the underlying array.
+    The wrapped array is exposed directly through the public ``a`` attribute so that
+    hot loops can bind the raw ndarray once (``arr = component.array.a``) and skip
+    Python-level attribute lookup and operator dispatch on every access.
 
-    This implementation uses __array_ufunc__ for ufunc calls and also
-    explicitly defines most of the special methods so that Python's built-in
-    operators (e.g., +, -, @) work as expected.
+    The wrapper still participates in NumPy operations: ufunc calls are forwarded
+    through ``__array_ufunc__`` and ``__array__``, and item access is forwarded for
+    convenience. Python operator dunders are intentionally not defined - code that
+    needs arithmetic should operate on ``wrapper.a`` directly.
     """
 
-    scale_factor = 1.5
+    # Geometric growth factor expressed as integer ratio (3/2), evaluated with
+    # integer arithmetic so the hot allocation path never round-trips through
+    # float.
+    growth_num = 3
+    growth_den = 2
+
+    __slots__ = ("a", "shape", "dtype", "ndim", "size")
 
     def __init__(self, array: np.ndarray):
-        self._array = array
+        self.a = array
+        self._refresh_meta()
+
+    def _refresh_meta(self) -> None:
+        """Refresh the cached array metadata slots.
+
+        Commonly queried attributes (shape, dtype, ndim, size) are cached as
+        real slots, so repeated access is a direct C-level read instead of a
+        Python-level __getattr__ round-trip to the ndarray.
+        """
+        arr = self.a
+        self.shape = arr.shape
+        self.dtype = arr.dtype
+        self.ndim = arr.ndim
+        self.size = arr.size
 
     def set_array(self, array: Union[np.ndarray, "ArrayWrapper"]) -> None:
         if isinstance(array, ArrayWrapper):
-            array = array._array
-        self._array = array
+            array = array.a
+        self.a = array
+        self._refresh_meta()
 
     def ensure_capacity(self, min_rows: int) -> None:
         """Ensure that the underlying array has at least `min_rows` rows.
 
         If the current number of rows is less than `min_rows`, the array is resized.
         The new capacity is the maximum of min_rows and twice the current row count.
-        New slots are filled with np.nan.
+        New slots are left uninitialized - callers track validity separately.
         """
-        current_rows, current_cols = self._array.shape
+        arr = self.a
+        current_rows, current_cols = arr.shape
         if min_rows <= current_rows:
             return
-        new_rows = max(min_rows, int(current_rows * self.scale_factor))
-        new_array = np.full((new_rows, current_cols), np.nan, dtype=self._array.dtype)
-        new_array[:current_rows] = self._array
+        new_rows = max(min_rows, current_rows * self.growth_num // self.growth_den)
+        # Fast path: extend the buffer in place (realloc, no copy of the live
+        # rows). Only safe when nothing else references the buffer - the
+        # refcount here is: the 'a' slot, the local, and getrefcount's
+        # argument. Single-column arrays only, since growing rows of a
+        # multi-column layout shifts the flat data of later columns.
+        if (
+            current_cols == 1
+            and arr.flags.owndata
+            and sys.getrefcount(arr) <= 3
+        ):
+            try:
+                arr.resize((new_rows, current_cols), refcheck=False)
+            except ValueError:
+                # resize still refuses buffers with weakrefs even with
+                # refcheck off - fall through to the copy path.
+                pass
+            else:
+                self._refresh_meta()
+                return
+        # Preserve the memory layout (column-major component storage stays SoA).
+        order = "F" if arr.flags.fnc else "C"
+        new_array = np.empty(
+            (new_rows, current_cols), dtype=arr.dtype, order=order
+        )
+        new_array[:current_rows] = arr
         self.set_array(new_array)
 
     def shrink_to(self, new_rows: int) -> None:
@@ -45,147 +93,44 @@ class ArrayWrapper:
         This method copies the first new_rows rows into a new array.
         Use with care: frequent shrinking can lead to performance issues.
         """
-        current_rows, current_cols = self._array.shape
+        current_rows, current_cols = self.a.shape
         if new_rows >= current_rows:
             return
-        new_array = np.copy(self._array[:new_rows])
+        new_array = np.copy(self.a[:new_rows])
         self.set_array(new_array)
 
     def __getitem__(self, key):
-        return self._array[key]
+        return self.a[key]
 
     def __setitem__(self, key, value):
-        self._array[key] = value
-
-    def __getattr__(self, attr):
-        return getattr(self._array, attr)
+        self.a[key] = value
 
     def __len__(self):
-        return len(self._array)
+        return len(self.a)
 
     def __array__(self, *args, **kwargs):
-        return self._array
+        return self.a
 
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
-        new_inputs = [x._array if isinstance(x, ArrayWrapper) else x for x in inputs]
-        result = getattr(ufunc, method)(*new_inputs, **kwargs)
-        if isinstance(result, np.ndarray):
-            return ArrayWrapper(result)
-        return result
-
-    # Arithmetic operators
-    def __add__(self, other):
-        return self._array + other
-
-    def __radd__(self, other):
-        return other + self._array
-
-    def __sub__(self, other):
-        return self._array - other
-
-    def __rsub__(self, other):
-        return other - self._array
-
-    def __mul__(self, other):
-        return self._array * other
-
-    def __rmul__(self, other):
-        return other * self._array
-
-    def __truediv__(self, other):
-        return self._array / other
-
-    def __rtruediv__(self, other):
-        return other / self._array
-
-    def __floordiv__(self, other):
-        return self._array // other
-
-    def __rfloordiv__(self, other):
-        return other // self._array
-
-    def __mod__(self, other):
-        return self._array % other
-
-    def __rmod__(self, other):
-        return other % self._array
-
-    def __pow__(self, other, modulo=None):
-        if modulo is None:
-            return self._array**other
-        return pow(self._array, other, modulo)
-
-    def __rpow__(self, other):
-        return other**self._array
-
-    def __matmul__(self, other):
-        return self._array @ other
-
-    def __rmatmul__(self, other):
-        return other @ self._array
-
-    # Unary operators
-    def __neg__(self):
-        return -self._array
-
-    def __pos__(self):
-        return +self._array
-
-    def __abs__(self):
-        return abs(self._array)
-
-    def __invert__(self):
-        return ~self._array
-
-    # Bitwise operators
-    def __and__(self, other):
-        return self._array & other
-
-    def __rand__(self, other):
-        return other & self._array
-
-    def __or__(self, other):
-        return self._array | other
-
-    def __ror__(self, other):
-        return other | self._array
-
-    def __xor__(self, other):
-        return self._array ^ other
-
-    def __rxor__(self, other):
-        return other ^ self._array
-
-    def __lshift__(self, other):
-        return self._array << other
-
-    def __rlshift__(self, other):
-        return other << self._array
-
-    def __rshift__(self, other):
-        return self._array >> other
-
-    def __rrshift__(self, other):
-        return other >> self._array
-
-    # Comparison operators
-    def __lt__(self, other):
-        return self._array < other
-
-    def __le__(self, other):
-        return self._array <= other
-
-    def __eq__(self, other):
-        return self._array == other
-
-    def __ne__(self, other):
-        return self._array != other
-
-    def __gt__(self, other):
-        return self._array > other
-
-    def __ge__(self, other):
-        return self._array >= other
+        # Specialized for the dominant 1- and 2-input cases: no intermediate
+        # list, `type(x) is` instead of an isinstance MRO walk, and results are
+        # returned as raw ndarrays - callers that want the wrapper updated use
+        # set_array explicitly.
+        if len(inputs) == 2:
+            a, b = inputs
+            if type(a) is ArrayWrapper:
+                a = a.a
+            if type(b) is ArrayWrapper:
+                b = b.a
+            return getattr(ufunc, method)(a, b, **kwargs)
+        if len(inputs) == 1:
+            (a,) = inputs
+            if type(a) is ArrayWrapper:
+                a = a.a
+            return getattr(ufunc, method)(a, **kwargs)
+        return getattr(ufunc, method)(
+            *(x.a if type(x) is ArrayWrapper else x for x in inputs), **kwargs
+        )
 
     def __repr__(self):
-        return repr(self._array)
+        return repr(self.a)
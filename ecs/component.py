@@ -1,4 +1,3 @@
-from abc import abstractmethod, ABC
 from numbers import Number
 from typing import Tuple, Union, Optional, TypeVar, Dict, Type, List
 import numpy as np
@@ -6,7 +5,7 @@ import numpy as np
 from ecs.array_wrapper import ArrayWrapper
 
 
-class Component(ABC):
+class Component:
     """Base class for Components
 
     Uses numpy arrays to store components data.
@@ -19,9 +18,11 @@ class Component(ABC):
 
     Performing updates on this component can be done by modifying the `array` of the
     component in place, or overriding it with an array with a similar shape,
-    e.g. `component.array = component.array * 3`
+    e.g. `component.array = component.array.a * 3`
     The internal numpy array is wrapped with a stable ArrayWrapper, so it can be
     overridden with a new array without updating the references.
+    Hot loops should bind the raw ndarray once via `component.array.a` and index it
+    directly, instead of going through the wrapper on every access.
     in any override - the shape of the new array must match the shape of the original.
 
     Alternatively, entity data can be accessed directly using the `get_value` and
@@ -32,16 +33,49 @@ class Component(ABC):
 
     initial_capacity = 3
 
-    __slots__ = ("_array", "entity_to_index", "free_slots", "size")
+    # Shrink the storage when fewer than 1/shrink_divisor of the rows are live.
+    shrink_divisor = 4
+
+    # dtype of the underlying array - float32 by default: games and simulations
+    # rarely need double precision, and halving the element size halves memory
+    # bandwidth and doubles SIMD lane count. Subclasses can override (e.g.
+    # np.float64 for high-precision data, np.int32 for integer components).
+    dtype = np.float32
+
+    __slots__ = (
+        "_array",
+        "_raw",
+        "_alive",
+        "_capacity",
+        "_coerce",
+        "_default_row",
+        "_sparse",
+        "index_to_entity",
+        "free_slots",
+        "size",
+    )
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Keep component instances dict-less: a stray __dict__ adds per-instance
+        # memory and defeats the slot layout. Checked at class creation so the
+        # cost is zero at instantiation time (and skipped entirely with -O).
+        if __debug__ and "__slots__" not in cls.__dict__:
+            raise TypeError(
+                f"Component subclass {cls.__name__!r} must define __slots__ "
+                "(use '__slots__ = ()' if no extra attributes are needed)."
+            )
+        if __debug__ and not isinstance(getattr(cls, "dimensions", None), int):
+            raise TypeError(
+                f"Component subclass {cls.__name__!r} must define dimensions "
+                "as a class-level int."
+            )
 
-    @property
-    @abstractmethod
-    def dimensions(self) -> int:
-        """
-        Return the number of elements stored per entity.
-        For example, a 2D position would have dimensions == 2.
-        """
-        pass
+    # Number of elements stored per entity - e.g. a 2D position has
+    # dimensions == 2. Declared as a plain class int (not a property) so hot
+    # paths read it with a direct attribute load, no descriptor call.
+    # Subclasses must set it; checked in __init_subclass__.
+    dimensions: int
 
     @property
     def _default(self) -> Tuple[Number, ...]:
@@ -52,20 +86,141 @@ class Component(ABC):
 
     def __init__(self) -> None:
         self._array = self._create_array(self.initial_capacity, self.dimensions)
-        self.entity_to_index: dict[int, int] = {}
+        # Direct ndarray reference for hot-path reads/writes - skips the
+        # wrapper's __setitem__/__getitem__ frame. Refreshed whenever the
+        # wrapped array is replaced (growth, shrink, array setter).
+        self._raw = self._array.a
+        # Row capacity cached as a plain int - the add() hot path compares
+        # against this instead of chasing wrapper attributes.
+        self._capacity: int = self.initial_capacity
+        # Packed validity bitset - one bit per entity id. Liveness is tracked
+        # here instead of NaN sentinels, so the storage dtype is unconstrained.
+        self._alive = np.zeros((self.initial_capacity + 63) >> 6, dtype=np.uint64)
+        # Default row materialized once - defaulted adds would otherwise
+        # rebuild a tuple (one PyObject per dimension) on every insert.
+        self._default_row = np.asarray(self._default, dtype=self.dtype)
+        # Value coercion resolved once per instance instead of per call: only
+        # 1d components accept bare scalars, so wider components skip the
+        # isinstance branch entirely on every add/update.
+        if self.dimensions == 1:
+            self._coerce = lambda v: (v,) if isinstance(v, Number) else v
+        else:
+            self._coerce = lambda v: v
+        # Sparse-set index: _sparse[entity_id] is the dense row holding that
+        # entity's data, -1 when absent. A flat int32 array replaces the old
+        # dict - lookups are straight-line array indexing with no hashing,
+        # and whole batches of ids translate to rows in one fancy index.
+        self._sparse = np.full(8, -1, dtype=np.int32)
+        # Reverse of _sparse for the dense region: index_to_entity[i] is the
+        # entity stored in row i. Kept so swap-remove can find the entity
+        # occupying the last row in O(1) instead of scanning the map.
+        self.index_to_entity: list[int] = []
         self.free_slots: list[int] = []
         self.size: int = 0
 
-    @staticmethod
-    def _create_array(capacity: int, dims: int) -> ArrayWrapper:
-        base_array = np.full((capacity, dims), np.nan)
+    @classmethod
+    def _create_array(cls, capacity: int, dims: int) -> ArrayWrapper:
+        # Column-major (SoA) layout: each dimension is a contiguous 1d column,
+        # so systems that touch a single axis stream through contiguous memory.
+        # Slots are left uninitialized - liveness lives in the _alive bitset.
+        #
+        # An AoSoA (tiled) layout was considered as a middle ground between
+        # per-axis and per-entity locality, but under NumPy each tile would be
+        # a separate Python-level operation, so the per-tile dispatch overhead
+        # exceeds the cache benefit at realistic entity counts. Whole-column
+        # ufuncs over this layout already vectorize in a single C call.
+        base_array = np.empty((capacity, dims), dtype=cls.dtype, order="F")
         return ArrayWrapper(base_array)
 
+    def _set_alive(self, entity_id: int) -> None:
+        word = entity_id >> 6
+        if word >= self._alive.shape[0]:
+            grown = np.zeros(max(word + 1, self._alive.shape[0] * 2), dtype=np.uint64)
+            grown[: self._alive.shape[0]] = self._alive
+            self._alive = grown
+        self._alive[word] |= np.uint64(1 << (entity_id & 63))
+
+    def _ensure_sparse(self, entity_id: int) -> None:
+        sparse = self._sparse
+        if entity_id >= sparse.shape[0]:
+            grown = np.full(
+                max(entity_id + 1, sparse.shape[0] * 2), -1, dtype=np.int32
+            )
+            grown[: sparse.shape[0]] = sparse
+            self._sparse = grown
+
+    def index_of(self, entity_id: int) -> int:
+        """Return the dense row holding an entity's data, or -1 if absent."""
+        sparse = self._sparse
+        if entity_id >= sparse.shape[0]:
+            return -1
+        return int(sparse[entity_id])
+
+    def rows_of(self, entity_ids) -> np.ndarray:
+        """Translate a batch of entity ids to dense rows with one fancy index.
+
+        All ids must have data in this component; absent ids come back as -1.
+        """
+        return self._sparse[entity_ids]
+
+    def _clear_alive(self, entity_id: int) -> None:
+        word = entity_id >> 6
+        if word < self._alive.shape[0]:
+            self._alive[word] &= ~np.uint64(1 << (entity_id & 63))
+
+    @property
+    def alive_mask(self) -> np.ndarray:
+        """Packed uint64 bitset with one bit per entity id.
+
+        Bitwise-ANDing the masks of two components yields the entities that
+        have both, 64 entities per word, without touching the data arrays.
+        """
+        return self._alive
+
+    def entities_with(self, *others: "Component") -> np.ndarray:
+        """Return the ids of entities that have this component and all `others`.
+
+        The packed alive bitsets are intersected 64 entities per AND and the
+        result is expanded to ids with a single unpackbits pass - no per-entity
+        Python checks and no reads of the data arrays.
+        """
+        masks = [self._alive] + [other._alive for other in others]
+        n = min(mask.shape[0] for mask in masks)
+        combined = masks[0][:n].copy()
+        for mask in masks[1:]:
+            combined &= mask[:n]
+        bits = np.unpackbits(combined.view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits)
+
+    def has_entity(self, entity_id: int) -> bool:
+        """Check whether an entity has data in this component (O(1) bit test)."""
+        word = entity_id >> 6
+        if word >= self._alive.shape[0]:
+            return False
+        return bool((self._alive[word] >> np.uint64(entity_id & 63)) & np.uint64(1))
+
     @property
     def array(self) -> ArrayWrapper:
         """Expose the underlying ArrayWrapper."""
         return self._array
 
+    def active(self) -> np.ndarray:
+        """Return the dense (size, dimensions) block of live rows.
+
+        Rows are kept compacted to [0, size) by swap-remove, so systems can
+        iterate this contiguous slice directly - no liveness checks and no
+        dead-slot gaps.
+        """
+        return self._raw[: self.size]
+
+    def column(self, dim: int) -> np.ndarray:
+        """Return the contiguous 1d array holding a single dimension for all entities.
+
+        The storage is column-major, so the returned view is contiguous and can be
+        used for vectorized single-axis updates (e.g. `pos_x += vel_x * dt`).
+        """
+        return self._raw[:, dim]
+
     @array.setter
     def array(self, value: Union[np.ndarray, ArrayWrapper]):
         if not isinstance(value, (np.ndarray, ArrayWrapper)):
@@ -73,7 +228,12 @@ class Component(ABC):
         expected_shape = (self._array.shape[0], self.dimensions)
         if value.shape != expected_shape:
             raise ValueError(f"Expected shape {expected_shape}, got {value.shape}.")
+        if value.dtype != self._array.dtype:
+            raise ValueError(
+                f"Expected dtype {self._array.dtype}, got {value.dtype}."
+            )
         self._array.set_array(value)
+        self._raw = self._array.a
 
     def add(
         self, entity_id: int, val: Optional[Union[Tuple[Number, ...], Number]] = None
@@ -85,25 +245,89 @@ class Component(ABC):
         The ArrayWrapper automatically ensures capacity if needed.
         """
         if val is None:
-            val = self._default
-        if isinstance(val, Number):
-            val = (val,)
-        if len(val) != self.dimensions:
-            raise ValueError(
-                f"Expected value with {self.dimensions} dimensions, got {len(val)}."
-            )
+            val = self._default_row
+        else:
+            val = self._coerce(val)
+            if __debug__ and len(val) != self.dimensions:
+                raise ValueError(
+                    f"Expected value with {self.dimensions} dimensions, "
+                    f"got {len(val)}."
+                )
 
         # Determine the index in the dense array.
         if self.free_slots:
             idx = self.free_slots.pop()
         else:
             idx = self.size
-            if idx >= self._array.shape[0]:
+            if idx >= self._capacity:
+                # Drop the raw alias for the duration of the resize - the
+                # wrapper's in-place growth fast path requires sole ownership
+                # of the buffer, and this alias would otherwise defeat it on
+                # every call.
+                self._raw = None
                 self._array.ensure_capacity(idx + 1)
-        self._array[idx] = val
-        self.entity_to_index[entity_id] = idx
+                self._capacity = self._array.shape[0]
+                self._raw = self._array.a
+        self._raw[idx] = val
+        self._ensure_sparse(entity_id)
+        self._sparse[entity_id] = idx
+        if idx == len(self.index_to_entity):
+            self.index_to_entity.append(entity_id)
+        else:
+            self.index_to_entity[idx] = entity_id
+        self._set_alive(entity_id)
         self.size += 1
 
+    def add_many(
+        self,
+        entity_ids: List[int],
+        vals: Optional[Union[np.ndarray, Tuple[Number, ...]]] = None,
+    ) -> None:
+        """Attach data for a batch of new entities with a single vectorized write.
+
+        All entities are placed in a contiguous block of rows at the end of the
+        dense region, so the per-entity Python overhead of `add` (type checks,
+        slot bookkeeping) is paid once per batch instead of once per entity.
+
+        Args:
+            entity_ids (List[int]): ids of the entities to add.
+            vals: optional initial data - either an array of shape
+                (len(entity_ids), dimensions) with one row per entity, or a
+                single row/scalar that is broadcast to all entities.
+                If not provided, the component default is used.
+        """
+        n = len(entity_ids)
+        if n == 0:
+            return
+        if vals is None:
+            vals = self._default_row
+        vals = np.asarray(vals)
+        if vals.ndim == 2 and vals.shape != (n, self.dimensions):
+            raise ValueError(
+                f"Expected values with shape {(n, self.dimensions)}, "
+                f"got {vals.shape}."
+            )
+
+        start = self.size
+        end = start + n
+        if end > self._capacity:
+            # See add(): release the raw alias so sole-owner buffers can be
+            # resized in place.
+            self._raw = None
+            self._array.ensure_capacity(end)
+            self._capacity = self._array.shape[0]
+            self._raw = self._array.a
+        self._raw[start:end] = vals
+        self._ensure_sparse(max(entity_ids))
+        self._sparse[entity_ids] = np.arange(start, end, dtype=np.int32)
+        for entity_id in entity_ids:
+            self._set_alive(entity_id)
+        self.index_to_entity.extend(entity_ids)
+        # The batch consumes the block [start, end) - drop free slots inside it.
+        if self.free_slots:
+            self.free_slots = [slot for slot in self.free_slots if slot >= end]
+        self.size = end
+
     def remove(self, entity_id: int) -> None:
         """
         Remove an entity's data from the component.
@@ -112,24 +336,85 @@ class Component(ABC):
         the removed slot, and the mapping is updated accordingly.
         The freed index is then added to the free list.
         """
-        # TODO - when size reaches below a certain threshold - reorganize indexes and
-        #   shrink array
-        if entity_id not in self.entity_to_index:
+        idx = self.index_of(entity_id)
+        if idx < 0:
             return
-        idx = self.entity_to_index.pop(entity_id)
+        self._sparse[entity_id] = -1
+        self._clear_alive(entity_id)
         last_index = self.size - 1
         if idx != last_index:
-            # Find the entity that occupies the last active slot.
-            swapped_entity = None
-            for ent, pos in self.entity_to_index.items():
-                if pos == last_index:
-                    swapped_entity = ent
-                    break
-            if swapped_entity is not None:
-                self._array[idx] = self._array[last_index]
-                self.entity_to_index[swapped_entity] = idx
+            # The reverse map names the entity in the last row directly.
+            swapped_entity = self.index_to_entity[last_index]
+            self._raw[idx] = self._raw[last_index]
+            self._sparse[swapped_entity] = idx
+            self.index_to_entity[idx] = swapped_entity
+        self.index_to_entity.pop()
         self.free_slots.append(last_index)
         self.size -= 1
+        self._maybe_shrink()
+
+    def remove_many(self, entity_ids: List[int]) -> None:
+        """Remove a batch of entities, compacting the dense region in one pass.
+
+        Surviving rows that end up above the new dense size are moved down into
+        the freed holes with a single fancy-index copy, instead of one
+        swap-and-pop per removed entity.
+
+        Args:
+            entity_ids (List[int]): ids of the entities to remove. ids without
+                data in this component are ignored.
+        """
+        sparse = self._sparse
+        removed_indices = set()
+        for entity_id in entity_ids:
+            if entity_id < sparse.shape[0]:
+                idx = int(sparse[entity_id])
+                if idx >= 0:
+                    removed_indices.add(idx)
+                    sparse[entity_id] = -1
+                    self._clear_alive(entity_id)
+        if not removed_indices:
+            return
+        new_size = self.size - len(removed_indices)
+        holes = sorted(idx for idx in removed_indices if idx < new_size)
+        if holes:
+            # Survivors stranded in the tail fill the holes below new_size.
+            index_to_entity = self.index_to_entity
+            tail = [
+                (index_to_entity[idx], idx)
+                for idx in range(new_size, self.size)
+                if idx not in removed_indices
+            ]
+            src = np.array([idx for _, idx in tail])
+            dst = np.array(holes)
+            self._raw[dst] = self._raw[src]
+            for (entity_id, _), hole in zip(tail, holes):
+                sparse[entity_id] = hole
+                index_to_entity[hole] = entity_id
+        del self.index_to_entity[new_size:]
+        # Freed LIFO so the lowest index is reused first, keeping the dense
+        # region gap-free as subsequent adds refill it.
+        self.free_slots.extend(reversed(range(new_size, self.size)))
+        self.size = new_size
+        self._maybe_shrink()
+
+    def _maybe_shrink(self) -> None:
+        """Shrink the storage when occupancy drops below the threshold.
+
+        Removal keeps the dense region compact but leaves freed rows allocated,
+        so create/destroy-heavy workloads would otherwise hold peak capacity
+        forever. Halving the capacity once occupancy falls below
+        1/shrink_divisor keeps the amortized cost low while returning memory.
+        """
+        if self._capacity <= self.initial_capacity:
+            return
+        if self.size * self.shrink_divisor >= self._capacity:
+            return
+        new_rows = max(self.initial_capacity, self._capacity // 2)
+        self._array.shrink_to(new_rows)
+        self._capacity = self._array.shape[0]
+        self._raw = self._array.a
+        self.free_slots = [slot for slot in self.free_slots if slot < new_rows]
 
     def update_value(
         self, entity_id: int, val: Union[Tuple[Number, ...], Number]
@@ -137,29 +422,85 @@ class Component(ABC):
         """
         Update the stored data for an entity.
         """
-        if entity_id not in self.entity_to_index:
+        idx = self.index_of(entity_id)
+        if idx < 0:
             raise ValueError("Entity not found.")
-        if isinstance(val, Number):
-            val = (val,)
-        if len(val) != self.dimensions:
+        val = self._coerce(val)
+        if __debug__ and len(val) != self.dimensions:
             raise ValueError(f"Expected {self.dimensions} dimensions, got {len(val)}.")
-        idx = self.entity_to_index[entity_id]
-        self._array[idx] = val
+        self._raw[idx] = val
+
+    def update_values(
+        self,
+        entity_ids: Union[np.ndarray, List[int]],
+        vals: Union[np.ndarray, Tuple[Number, ...]],
+    ) -> None:
+        """Overwrite the rows of a batch of entities with one fancy-indexed store.
+
+        All ids must have data in this component. `vals` is either one row per
+        entity (shape `(len(entity_ids), dimensions)`) or a single row that is
+        broadcast. Callers whose values are already aligned with the dense
+        region should write to `active()` directly instead.
+        """
+        self._raw[self._sparse[entity_ids]] = vals
 
     def get_value(self, entity_id: int) -> Tuple[Number, ...]:
         """
         Retrieve the stored data for an entity.
         """
-        if entity_id not in self.entity_to_index:
+        idx = self.index_of(entity_id)
+        if idx < 0:
             raise ValueError("Entity not found.")
-        idx = self.entity_to_index[entity_id]
-        return tuple(self._array[idx])
+        return tuple(self._raw[idx])
 
 
 _T = TypeVar("_T", bound=Component)
 _CompDataT = Dict[Type[Component], _T]
 
 
+class TagComponent(Component):
+    """Base class for zero-data marker components (tags).
+
+    Tags like `Locked` or `IsDead` carry no per-entity values - their entire
+    meaning is "this entity has the component". Presence is already encoded in
+    the archetype signature and the alive bitset, so a tag allocates no array
+    row, index-map entry, or free slot per entity.
+
+    Use `has_entity` / `entities_with` / `alive_mask` to test membership;
+    `get_value` and `update_value` are meaningless for tags.
+    """
+
+    __slots__ = ()
+
+    dimensions = 0
+
+    def add(
+        self,
+        entity_id: int,
+        val: Optional[Union[Tuple[Number, ...], Number]] = None,
+    ) -> None:
+        """Mark the entity as having this tag. `val` is ignored."""
+        self._set_alive(entity_id)
+
+    def remove(self, entity_id: int) -> None:
+        """Clear the tag from the entity."""
+        self._clear_alive(entity_id)
+
+    def add_many(
+        self,
+        entity_ids: List[int],
+        vals: Optional[Union[np.ndarray, Tuple[Number, ...]]] = None,
+    ) -> None:
+        """Mark a batch of entities as having this tag. `vals` is ignored."""
+        for entity_id in entity_ids:
+            self._set_alive(entity_id)
+
+    def remove_many(self, entity_ids: List[int]) -> None:
+        """Clear the tag from a batch of entities."""
+        for entity_id in entity_ids:
+            self._clear_alive(entity_id)
+
+
 class ComponentRegistry:
     """Stores components information per-world
 
@@ -169,6 +510,9 @@ class ComponentRegistry:
 
     def __init__(self):
         self._component_bits: Dict[Type[Component], int] = {}
+        # Inverse of _component_bits - lets signature consumers iterate only
+        # the set bits of a mask instead of every registered type.
+        self._bit_to_type: Dict[int, Type[Component]] = {}
         self._next_bit = 1
         self.components: _CompDataT = {}
 
@@ -176,10 +520,13 @@ class ComponentRegistry:
         self.components[comp_type] = instance
 
     def get_bit(self, comp_type):
-        if comp_type not in self._component_bits:
-            self._component_bits[comp_type] = self._next_bit
+        bit = self._component_bits.get(comp_type)
+        if bit is None:
+            bit = self._next_bit
+            self._component_bits[comp_type] = bit
+            self._bit_to_type[bit] = comp_type
             self._next_bit <<= 1
-        return self._component_bits[comp_type]
+        return bit
 
     def compute_signature(
         self, components: Union[List[Type[Component]], _CompDataT]
@@ -196,9 +543,16 @@ class ComponentRegistry:
             an integer that represents the signature of this component composition.
             Each component affects a unique bit in that signature.
         """
+        # Read the bit dict through a local and only fall back to get_bit for
+        # unseen types - this runs on every create/add/remove/query, and the
+        # hoisted lookup skips a method call per component on the common path.
+        bits = self._component_bits
         signature = 0
         for comp_type in components:
-            signature |= self.get_bit(comp_type)
+            bit = bits.get(comp_type)
+            if bit is None:
+                bit = self.get_bit(comp_type)
+            signature |= bit
         return signature
 
     def __contains__(self, key):
@@ -1,11 +1,22 @@
-from typing import Callable, Dict, List, Optional, Type, TypeVar
+from typing import Callable, Dict, List, Optional, Tuple, Type, TypeVar
 from weakref import ref, WeakMethod
 
 
 class Event:
-    """Base class for events."""
+    """Base class for events.
 
-    pass
+    Each subclass is assigned a small integer id at class-creation time. The
+    EventBus uses that id to index its handler storage directly, instead of
+    hashing the type object on every publish.
+    """
+
+    _ev_id = 0
+    _next_id = 1
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._ev_id = Event._next_id
+        Event._next_id += 1
 
 
 _T = TypeVar("_T", bound=Event)
@@ -13,6 +24,10 @@ _T = TypeVar("_T", bound=Event)
 
 WeakCallable = Callable[[], Optional[Callable[[_T], None]]]
 
+# Above this many subscribed event types, the generated async dispatcher's
+# if/elif chain stops paying off and the generic dict-lookup path is used.
+_CODEGEN_MAX_TYPES = 16
+
 
 class EventBus:
     """Stores and dispatches events.
@@ -27,10 +42,19 @@ class EventBus:
     """
 
     def __init__(self) -> None:
-        self._subscribers: Dict[Type[_T], List[WeakCallable]] = {}
+        # Handler tuples are frozen at subscribe/unsubscribe time, so dispatch
+        # iterates an immutable snapshot with no defensive copies. Storage is a
+        # flat list indexed by Event._ev_id - an array index per publish
+        # instead of hashing the type object.
+        self._subscribers: List[Tuple[WeakCallable, ...]] = []
+        # Parallel list recording the event type per id (for unsubscribe checks
+        # and dispatcher codegen).
+        self._event_types: List[Optional[Type[_T]]] = []
         # Two buffers for asynchronous events.
         self._current_async_queue: List[_T] = []
         self._next_async_queue: List[_T] = []
+        # Specialized async dispatcher, rebuilt lazily when subscriptions change.
+        self._dispatch: Optional[Callable[[_T], None]] = None
 
     def subscribe(self, event_type: Type[_T], handler: Callable[[_T], None]) -> None:
         """Subscribe a handler to a specific event type.
@@ -48,21 +72,25 @@ class EventBus:
             reference has to be active for it to be called.
             This also means that this feature does not work with `lambda` functions.
         """
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
+        index = event_type._ev_id
 
         # Callback to remove dead references.
         def _remove(_weak_handler) -> None:
-            try:
-                self._subscribers[event_type].remove(_weak_handler)
-            except ValueError:
-                pass
+            current = self._subscribers[index]
+            if _weak_handler in current:
+                self._subscribers[index] = tuple(
+                    wh for wh in current if wh is not _weak_handler
+                )
+                self._dispatch = None
 
         try:
             weak_handler = WeakMethod(handler, _remove)
         except TypeError:
             weak_handler = ref(handler, _remove)
-        self._subscribers[event_type].append(weak_handler)
+        self._grow_to(index)
+        self._subscribers[index] = self._subscribers[index] + (weak_handler,)
+        self._event_types[index] = event_type
+        self._dispatch = None
 
     def unsubscribe(self, event_type: Type[_T], handler: Callable[[_T], None]) -> None:
         """Unsubscribe a handler from a specific event type.
@@ -71,11 +99,14 @@ class EventBus:
             event_type (Type[Event]): The type of event.
             handler (Callable[[Event], None]): The handler to remove.
         """
-        if event_type in self._subscribers:
-            for weak_handler in self._subscribers[event_type][:]:
-                actual = weak_handler()
-                if actual is None or actual == handler:
-                    self._subscribers[event_type].remove(weak_handler)
+        index = event_type._ev_id
+        if index < len(self._subscribers):
+            self._subscribers[index] = tuple(
+                weak_handler
+                for weak_handler in self._subscribers[index]
+                if (actual := weak_handler()) is not None and actual != handler
+            )
+            self._dispatch = None
 
     def publish_sync(self, event: _T) -> None:
         """Publish an event synchronously.
@@ -85,13 +116,13 @@ class EventBus:
         Args:
             event (Event): The event to publish.
         """
-        if not isinstance(event, Event):
-            raise TypeError("Published event must be an instance of Event")
-        event_type = type(event)
-        for weak_handler in self._subscribers.get(event_type, []):
-            actual = weak_handler()
-            if actual is not None:
-                actual(event)
+        subscribers = self._subscribers
+        index = type(event)._ev_id
+        if index < len(subscribers):
+            for weak_handler in subscribers[index]:
+                actual = weak_handler()
+                if actual is not None:
+                    actual(event)
 
     def publish_async(self, event: _T) -> None:
         """Publish an event asynchronously.
@@ -106,6 +137,53 @@ class EventBus:
             raise TypeError("Published event must be an instance of Event")
         self._next_async_queue.append(event)
 
+    def _grow_to(self, index: int) -> None:
+        """Extend the id-indexed storage to cover the given event-type id."""
+        while len(self._subscribers) <= index:
+            self._subscribers.append(())
+            self._event_types.append(None)
+
+    def _dispatch_generic(self, event: _T) -> None:
+        """Fallback dispatcher: id-indexed lookup per event."""
+        subscribers = self._subscribers
+        index = type(event)._ev_id
+        if index < len(subscribers):
+            for weak_handler in subscribers[index]:
+                actual = weak_handler()
+                if actual is not None:
+                    actual(event)
+
+    def _build_dispatch(self) -> None:
+        """Generate a straight-line dispatcher specialized for the current handlers.
+
+        The generated function hard-codes an `if t is EventType:` chain with the
+        handler weakrefs bound in its globals, so draining the async queue pays
+        no lookup or nested loop per event. Falls back to the generic
+        id-indexed path when many event types are subscribed.
+        """
+        subscribed = {
+            self._event_types[i]: hs
+            for i, hs in enumerate(self._subscribers)
+            if hs and self._event_types[i] is not None
+        }
+        if not subscribed or len(subscribed) > _CODEGEN_MAX_TYPES:
+            self._dispatch = self._dispatch_generic
+            return
+        lines = ["def _dispatch(event, _type=type):", "    event_type = _type(event)"]
+        namespace: Dict[str, object] = {}
+        branch = "if"
+        for i, (event_type, handlers) in enumerate(subscribed.items()):
+            namespace[f"_type{i}"] = event_type
+            lines.append(f"    {branch} event_type is _type{i}:")
+            for j, weak_handler in enumerate(handlers):
+                namespace[f"_weak{i}_{j}"] = weak_handler
+                lines.append(f"        handler = _weak{i}_{j}()")
+                lines.append("        if handler is not None:")
+                lines.append("            handler(event)")
+            branch = "elif"
+        exec("\n".join(lines), namespace)
+        self._dispatch = namespace["_dispatch"]
+
     def process_async(self) -> None:
         """
         Process all queued asynchronous events.
@@ -113,15 +191,19 @@ class EventBus:
         Uses double buffering to ensure events published in the current frame
         aren't processed until the next update cycle.
         """
-        # Swap queues and reset next queue.
-        self._current_async_queue, self._next_async_queue = self._next_async_queue, []
+        # Swap the two long-lived buffers instead of allocating a fresh list
+        # every frame; the previous frame's processed buffer is cleared and
+        # becomes the new publish target.
+        self._current_async_queue, self._next_async_queue = (
+            self._next_async_queue,
+            self._current_async_queue,
+        )
+        self._next_async_queue.clear()
+        if self._dispatch is None:
+            self._build_dispatch()
+        dispatch = self._dispatch
         for event in self._current_async_queue:
-            event_type = type(event)
-            for weak_handler in self._subscribers.get(event_type, []):
-                actual = weak_handler()
-                if actual is not None:
-                    actual(event)
-        self._current_async_queue.clear()
+            dispatch(event)
 
     def update(self) -> None:
         """Update the event bus by processing asynchronous events."""
@@ -9,6 +9,8 @@ class System(ABC):
     # the World.update() function can update systems of specific groups.
     group: str = "default"
 
+    __slots__ = ("priority", "enabled", "name")
+
     def __init__(
         self, priority: float = 10.0, enabled: bool = True, name: Optional[str] = None
     ) -> None:
@@ -30,6 +32,12 @@ class System(ABC):
         """
         Optional hook called when the system is added to the world.
         Use this for one-time setup (resource allocation, caching, etc.).
+
+        In particular, cache the component instances the system operates on
+        here (e.g. `self.pos_comp = world.get_component_instance(Position)`)
+        instead of looking them up every tick. The component's ArrayWrapper
+        reference is stable across growth, so bind the raw ndarray once per
+        update via `self.pos_comp.array.a` inside `update()`.
         """
         pass
 
@@ -1,7 +1,22 @@
+from array import array
+from bisect import insort
 from numbers import Number
-from typing import Dict, List, Optional, Tuple, Union, TypeVar, Type
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    TypeVar,
+    Type,
+)
 import warnings
 
+import numpy as np
+
 from ecs.resources import Resources
 from ecs.system import System
 from ecs.component import Component, ComponentRegistry
@@ -11,27 +26,56 @@ _T = TypeVar("_T", bound=Component)
 _CompDataT = Dict[Type[Component], _T]
 
 
+def _system_priority(system: System) -> float:
+    return system.priority
+
+
+# Entity slots pack (archetype_id << 32) | index_within_archetype; -1 = free.
+_SLOT_INDEX_MASK = 0xFFFFFFFF
+
+
 class Archetype:
     """An archetype groups entities that share the same component composition.
 
     It stores:
       - signature: an integer bitmask representing the set of component types.
+      - archetype_id: the archetype's index in the world's archetype list,
+        used in the world's packed entity-slot array.
       - entities: a list of entity IDs.
-      - storage: a dictionary mapping component types to a list of component data.
-      - index_map: mapping from entity ID to its index in the storage arrays.
+      - storage: a dictionary mapping component types to their (single, shared)
+        component instance. The actual per-entity values live in the instance's
+        dense numpy array, which already provides contiguous SoA columns - the
+        archetype only tracks membership.
+
+    The entity's index within the archetype is tracked by the owning World in a
+    packed slot array indexed directly by entity id - entity ids are dense and
+    recycled, so a list index replaces a hash lookup on every swap-and-pop.
 
     Removal uses a swap‐and‐pop strategy for efficiency.
     """
 
-    __slots__ = ("signature", "entities", "storage", "index_map")
+    __slots__ = (
+        "signature",
+        "archetype_id",
+        "entities",
+        "storage",
+        "add_edges",
+        "remove_edges",
+    )
 
-    def __init__(self, signature: int) -> None:
+    def __init__(self, signature: int, archetype_id: int) -> None:
         self.signature: int = signature
+        self.archetype_id: int = archetype_id
         self.entities: List[int] = []
-        self.storage: Dict[Type[Component], List[Component]] = {}
-        self.index_map: Dict[int, int] = {}  # entity_id -> index
-
-    def add_entity(self, entity_id: int, components: _CompDataT) -> None:
+        self.storage: Dict[Type[Component], Component] = {}
+        # Archetype-graph edges: the neighbor archetype reached by adding or
+        # removing one component type. Memoized on first transition so
+        # repeated add_component/remove_component moves are a single dict hop
+        # with no signature computation.
+        self.add_edges: Dict[Type[Component], "Archetype"] = {}
+        self.remove_edges: Dict[Type[Component], "Archetype"] = {}
+
+    def add_entity(self, entity_id: int, components: _CompDataT) -> int:
         """Add an entity along with its component data.
 
         Assumes that the keys of `components` match the archetype's composition.
@@ -40,41 +84,59 @@ class Archetype:
             entity_id (int): id of the entity to add
             components (_CompDataT): Dictionary of {type: instance} with the components
                 of that entity.
+
+        Returns:
+            the entity's index within the archetype
         """
         index = len(self.entities)
         self.entities.append(entity_id)
-        self.index_map[entity_id] = index
-        for comp_type, comp_instance in components.items():
-            if comp_type not in self.storage:
-                self.storage[comp_type] = []
-            self.storage[comp_type].append(comp_instance)
+        # _get_archetype pre-initializes storage for every type in the
+        # signature (all types are registered before the archetype is
+        # created), so there is nothing to populate per entity.
+        assert self.storage.keys() == components.keys(), (
+            "archetype storage does not match the entity's component set"
+        )
+        return index
 
-    def remove_entity(self, entity_id: int) -> Optional[_CompDataT]:
-        """Remove an entity using swap‐and‐pop.
+    def add_entities(self, entity_ids: List[int], components: _CompDataT) -> int:
+        """Bulk-add entities sharing the archetype's component composition.
 
-        Returns the removed component data (for potential reuse) or None if not found.
+        Args:
+            entity_ids (List[int]): ids of the entities to add
+            components (_CompDataT): Dictionary of {type: instance} with the
+                components shared by all of the entities.
+
+        Returns:
+            the index of the first added entity (the rest follow contiguously)
+        """
+        index = len(self.entities)
+        self.entities.extend(entity_ids)
+        assert self.storage.keys() == components.keys(), (
+            "archetype storage does not match the entities' component set"
+        )
+        return index
+
+    def remove_entity_at(self, index: int) -> int:
+        """Remove the entity at the given index using swap‐and‐pop.
+
+        The last entity is swapped into the vacated index unconditionally -
+        when the removed entity is itself last, the swap is a harmless
+        self-write, which is cheaper than an unpredictable branch on the hot
+        removal path.
 
         Args:
-            entity_id (int): id of the entity to remove
+            index (int): index of the entity within the archetype
+
+        Returns:
+            the id of the entity now occupying the vacated index (the removed
+            entity itself when it was last). The caller must update that
+            entity's slot and then overwrite the removed entity's slot.
         """
-        if entity_id not in self.index_map:
-            return None
-        index = self.index_map[entity_id]
-        last_index = len(self.entities) - 1
-        removed_data: _CompDataT = {}
-        for comp_type, data_list in self.storage.items():
-            removed_data[comp_type] = data_list[index]
-        if index != last_index:
-            last_entity = self.entities[last_index]
-            self.entities[index] = last_entity
-            self.index_map[last_entity] = index
-            for comp_type, data_list in self.storage.items():
-                data_list[index] = data_list[last_index]
-        self.entities.pop()
-        for comp_type, data_list in self.storage.items():
-            data_list.pop()
-        del self.index_map[entity_id]
-        return removed_data
+        entities = self.entities
+        moved_entity = entities[-1]
+        entities[index] = moved_entity
+        entities.pop()
+        return moved_entity
 
 
 class World:
@@ -85,42 +147,79 @@ class World:
     It supports:
       - Archetype‐based storage for components (using bit masks).
       - A system update loop.
-      - Query caching to speed up repeated queries.
+      - Per-mask archetype caching to speed up repeated queries.
       - Efficient cleanup via free lists and swap‐and‐pop removal.
     """
 
     def __init__(self) -> None:
         self.archetypes: Dict[int, Archetype] = {}
-        self.entity_to_archetype: Dict[int, Archetype] = {}
-        self.entity_components: Dict[int, _CompDataT] = {}
-        self.free_ids: List[int] = []
+        # Inverted index: component bit -> archetypes whose signature has that
+        # bit. Queries intersect these sets instead of scanning every
+        # archetype, so cost scales with the number of matches. Archetypes are
+        # never destroyed, so the sets only grow and nothing invalidates them.
+        self._archetypes_by_bit: Dict[int, Set[Archetype]] = {}
+        # Archetypes in creation order, indexed by archetype_id.
+        self._archetype_list: List[Archetype] = []
+        # Packed per-entity location, indexed by entity id:
+        # (archetype_id << 32) | index_within_archetype, -1 for free ids.
+        # Entity ids are dense and recycled, so a flat list replaces the
+        # entity->archetype and entity->index hash lookups on hot paths.
+        self._entity_slot: List[int] = []
+        # Recycled entity ids as a packed int array - same pop/append use as a
+        # list, but machine ints instead of PyObject pointers (~4x denser).
+        self.free_ids = array("q")
         self.next_entity_id: int = 0
         self.num_entities: int = 0
 
         self.systems: List[System] = []
+        # Priority-sorted view per system group, maintained at registration
+        # time so update_systems never filters or sorts per frame.
+        self._systems_by_group: Dict[str, List[System]] = {}
 
-        self.query_cache: Dict[int, Tuple[List[Tuple[int, _CompDataT]], int]] = {}
-        self.world_version: int = 0
+        # Query cache: query mask -> list of matching archetypes. Archetype
+        # membership depends only on the component set, so entity churn never
+        # invalidates an entry - only the creation of a new archetype appends
+        # to the entries it matches (see _get_archetype).
+        self._mask_to_archetypes: Dict[int, List[Archetype]] = {}
+
+        # Structural changes queued by systems during iteration, applied once
+        # per update by flush_commands().
+        self._pending_commands: List[Tuple] = []
+
+        # Generated per-signature query functions (see compiled_query).
+        self._compiled_queries: Dict[Tuple[Type[Component], ...], Callable] = {}
+
+        # Memoized query masks keyed by the component-type tuple, so repeated
+        # queries skip the per-type bit OR loop entirely.
+        self._query_masks: Dict[Tuple[Type[Component], ...], int] = {}
 
         self.event_bus = EventBus()
         self.component_registry = ComponentRegistry()
 
         self.resources = Resources()
 
-    def _invalidate_query_cache(self) -> None:
-        """clear cache and update world version"""
-        self.query_cache.clear()
-        self.world_version += 1
-
     def _get_archetype(self, signature: int) -> Archetype:
         """Get archetype by signature"""
         if signature not in self.archetypes:
-            archetype = Archetype(signature)
-            for comp_type in self.component_registry.components:
-                bit = self.component_registry.get_bit(comp_type)
-                if signature & bit:
-                    archetype.storage[comp_type] = []
+            archetype = Archetype(signature, len(self._archetype_list))
+            self._archetype_list.append(archetype)
             self.archetypes[signature] = archetype
+            # Iterate only the set bits of the signature (lowest-bit
+            # extraction) instead of scanning every registered type.
+            registry = self.component_registry
+            bit_to_type = registry._bit_to_type
+            remaining = signature
+            while remaining:
+                bit = remaining & -remaining
+                comp_type = bit_to_type[bit]
+                archetype.storage[comp_type] = registry.components[comp_type]
+                self._archetypes_by_bit.setdefault(bit, set()).add(archetype)
+                remaining ^= bit
+            # A new archetype is the only event that can extend a cached query
+            # result - append it to every entry it matches.
+            for mask, matched in self._mask_to_archetypes.items():
+                if (signature & mask) == mask:
+                    matched.append(archetype)
         return self.archetypes[signature]
 
     def register_component(
@@ -164,14 +263,21 @@ class World:
         """
         Return the registered component for the given type, initializing it if necessary
         """
-        if comp_type not in self.component_registry:
+        # Fast path: a single dict.get - this is called for every component of
+        # every created entity, so the already-registered case must stay cheap.
+        instance = self.component_registry.components.get(comp_type)
+        if instance is None:
             self.register_component(comp_type)
-        return self.component_registry[comp_type]
+            instance = self.component_registry.components[comp_type]
+        return instance
 
     def register_system(self, system: System) -> None:
         system.initialize(self)
-        self.systems.append(system)
-        self.systems.sort(key=lambda s: s.priority)
+        # Insert in priority order instead of re-sorting the whole list on
+        # every registration.
+        insort(self.systems, system, key=_system_priority)
+        group_systems = self._systems_by_group.setdefault(system.group, [])
+        insort(group_systems, system, key=_system_priority)
 
     def create_entity(
         self,
@@ -183,8 +289,7 @@ class World:
         """Create an entity with a list of component types.
 
         Each component type is looked up in the registry (and created automatically
-        if needed), and the resulting mapping is stored for that entity. Optionally,
-        a mapping of initial data can be supplied.
+        if needed). Optionally, a mapping of initial data can be supplied.
 
         Args:
             components (List[Type[Component]]): list of component types to be attached
@@ -197,50 +302,192 @@ class World:
         Returns:
             the new entity's id
         """
-        comp_data: _CompDataT = {
-            comp_type: self.get_component_instance(comp_type)
-            for comp_type in components
-        }
         if self.free_ids:
             entity_id = self.free_ids.pop()
         else:
             entity_id = self.next_entity_id
             self.next_entity_id += 1
-        signature = self.component_registry.compute_signature(components)
+            self._entity_slot.append(-1)
+        # One pass over the types builds the instance dict, accumulates the
+        # signature, and attaches the per-entity data - mass-spawn workloads
+        # are allocation-bound, so the second walk over the dict (and the
+        # extra iteration inside compute_signature) is worth folding away.
+        comp_data: _CompDataT = {}
+        get_bit = self.component_registry.get_bit
+        get_init = component_initial_data.get if component_initial_data else None
+        signature = 0
+        for comp_type in components:
+            comp_instance = self.get_component_instance(comp_type)
+            comp_data[comp_type] = comp_instance
+            signature |= get_bit(comp_type)
+            comp_instance.add(
+                entity_id, get_init(comp_type) if get_init else None
+            )
         archetype = self._get_archetype(signature)
-        archetype.add_entity(entity_id, comp_data)
-        self.entity_to_archetype[entity_id] = archetype
-        self.entity_components[entity_id] = comp_data.copy()
-        for comp_type, comp_instance in comp_data.items():
-            init_val = None
-            if component_initial_data and comp_type in component_initial_data:
-                init_val = component_initial_data[comp_type]
-            comp_instance.add(entity_id, init_val)
-        self._invalidate_query_cache()
+        index = archetype.add_entity(entity_id, comp_data)
+        self._entity_slot[entity_id] = (archetype.archetype_id << 32) | index
         self.num_entities += 1
         return entity_id
 
+    def spawn_batch(
+        self,
+        components: List[Type[Component]],
+        count: int,
+        component_initial_data: Optional[
+            Dict[Type[Component], Union[Tuple, List]]
+        ] = None,
+    ) -> List[int]:
+        """Create `count` entities sharing the same component composition.
+
+        The signature is computed and the archetype fetched once for the whole
+        batch, and each component receives its values through a single
+        add_many call instead of `count` scalar adds - use this for bulk spawns
+        (scene init, particle bursts) instead of looping create_entity.
+
+        Args:
+            components (List[Type[Component]]): list of component types to be
+                attached to every entity in the batch.
+            count (int): number of entities to create.
+            component_initial_data: dictionary of {type: vals} where vals is
+                either a single row (broadcast to all entities) or an
+                array-like of `count` rows. Components without an entry use
+                their class default.
+
+        Returns:
+            list of the new entity ids, in creation order
+        """
+        comp_data: _CompDataT = {
+            comp_type: self.get_component_instance(comp_type)
+            for comp_type in components
+        }
+        signature = self.component_registry.compute_signature(comp_data)
+        archetype = self._get_archetype(signature)
+
+        slots = self._entity_slot
+        free_ids = self.free_ids
+        entity_ids = []
+        for _ in range(count):
+            if free_ids:
+                entity_ids.append(free_ids.pop())
+            else:
+                entity_ids.append(self.next_entity_id)
+                self.next_entity_id += 1
+                slots.append(-1)
+
+        base_index = archetype.add_entities(entity_ids, comp_data)
+        archetype_bits = archetype.archetype_id << 32
+        for offset, entity_id in enumerate(entity_ids):
+            slots[entity_id] = archetype_bits | (base_index + offset)
+
+        for comp_type, comp_instance in comp_data.items():
+            vals = None
+            if component_initial_data:
+                vals = component_initial_data.get(comp_type)
+            comp_instance.add_many(entity_ids, vals)
+        self.num_entities += count
+        return entity_ids
+
+    def entity_exists(self, entity_id: int) -> bool:
+        """Check whether an entity id is currently alive in the world."""
+        slots = self._entity_slot
+        return 0 <= entity_id < len(slots) and slots[entity_id] != -1
+
+    def components_of(self, entity_id: int) -> _CompDataT:
+        """Return {type: instance} for all the components of an entity.
+
+        The mapping is reconstructed on demand from the entity's archetype -
+        the world keeps no per-entity component dict. The returned dict is a
+        fresh copy; mutating it does not affect the entity.
+
+        Args:
+            entity_id (int): the id of the entity
+
+        Raises:
+            ValueError - the entity does not exist
+        """
+        slots = self._entity_slot
+        slot = slots[entity_id] if 0 <= entity_id < len(slots) else -1
+        if slot == -1:
+            raise ValueError("Entity does not exist.")
+        return dict(self._archetype_list[slot >> 32].storage)
+
     def remove_entity(self, entity_id: int) -> None:
         """Remove an entity from the world.
 
-        This action invalidates the query cache.
-
         Args:
             entity_id (int): the id of the entity to be removed
         """
-        if entity_id not in self.entity_to_archetype:
+        slots = self._entity_slot
+        slot = slots[entity_id] if 0 <= entity_id < len(slots) else -1
+        if slot == -1:
             warnings.warn("Entity not found.")
             return
-        archetype = self.entity_to_archetype.pop(entity_id)
-        archetype.remove_entity(entity_id)
-        for comp_type in self.entity_components[entity_id]:
-            comp = self.get_component_instance(comp_type)
-            comp.remove(entity_id)
-        self.entity_components.pop(entity_id, None)
+        archetype = self._archetype_list[slot >> 32]
+        moved_entity = archetype.remove_entity_at(slot & _SLOT_INDEX_MASK)
+        # The swapped entity inherits the removed entity's slot; when the
+        # removed entity was last the self-write is overwritten right after.
+        slots[moved_entity] = slot
+        slots[entity_id] = -1
+        for comp_instance in archetype.storage.values():
+            comp_instance.remove(entity_id)
         self.free_ids.append(entity_id)
-        self._invalidate_query_cache()
         self.num_entities -= 1
 
+    def remove_entities(self, entity_ids: Iterable[int]) -> None:
+        """Remove a batch of entities with one compaction pass per structure.
+
+        Looping remove_entity does one swap-and-pop per entity in every
+        touched archetype and component. Here each affected archetype's
+        entity list is rebuilt once (reindexing the survivors in a single
+        pass) and each component compacts once via remove_many, so the cost
+        is one pass over the affected structures regardless of the batch
+        size. Use this for bulk despawns (cleanup sweeps, scene teardown)
+        instead of looping remove_entity.
+
+        Args:
+            entity_ids (Iterable[int]): ids of the entities to remove. ids
+                that do not exist trigger a warning and are skipped, matching
+                remove_entity.
+        """
+        slots = self._entity_slot
+        by_archetype: Dict[int, List[int]] = {}
+        for entity_id in entity_ids:
+            slot = slots[entity_id] if 0 <= entity_id < len(slots) else -1
+            if slot == -1:
+                warnings.warn("Entity not found.")
+                continue
+            # Freeing the slot immediately also makes duplicate ids in the
+            # batch take the warn-and-skip path above.
+            slots[entity_id] = -1
+            by_archetype.setdefault(slot >> 32, []).append(entity_id)
+        if not by_archetype:
+            return
+        ids_by_component: Dict[Component, List[int]] = {}
+        removed_total = 0
+        for archetype_id, removed_ids in by_archetype.items():
+            archetype = self._archetype_list[archetype_id]
+            removed = set(removed_ids)
+            survivors = [
+                entity_id
+                for entity_id in archetype.entities
+                if entity_id not in removed
+            ]
+            # In-place assignment keeps the list identity that cached query
+            # results and compiled queries hold on to.
+            archetype.entities[:] = survivors
+            archetype_bits = archetype_id << 32
+            for index, entity_id in enumerate(survivors):
+                slots[entity_id] = archetype_bits | index
+            for comp_instance in archetype.storage.values():
+                ids_by_component.setdefault(comp_instance, []).extend(
+                    removed_ids
+                )
+            self.free_ids.extend(removed_ids)
+            removed_total += len(removed_ids)
+        for comp_instance, ids in ids_by_component.items():
+            comp_instance.remove_many(ids)
+        self.num_entities -= removed_total
+
     def add_component(
         self,
         entity_id: int,
@@ -249,9 +496,8 @@ class World:
     ) -> None:
         """Add a component to an existing entity.
 
-        The component is added to the entity's mapping and its data is stored via its
-        own array.
-        This action updates the Archetype of the entity and invalidates the query cache
+        The component's data is stored via its own array.
+        This action updates the Archetype of the entity.
 
         Args:
             entity_id (int): the entity to add the component to
@@ -260,47 +506,278 @@ class World:
                 component dimension (can be a single value for 1d components).
                 if not provided - the default from the Component class will be used.
         """
-        current = self.entity_components.get(entity_id)
-        if current is None:
+        slots = self._entity_slot
+        slot = slots[entity_id] if 0 <= entity_id < len(slots) else -1
+        if slot == -1:
             raise ValueError("Entity does not exist.")
-        if comp_type in current:
+        old_archetype = self._archetype_list[slot >> 32]
+        if comp_type in old_archetype.storage:
             raise ValueError("Entity already has this component.")
-        old_archetype = self.entity_to_archetype[entity_id]
-        old_archetype.remove_entity(entity_id)
-        current[comp_type] = self.get_component_instance(comp_type)
-        self.entity_components[entity_id] = current
-        new_signature = self.component_registry.compute_signature(list(current.keys()))
-        new_archetype = self._get_archetype(new_signature)
-        new_archetype.add_entity(entity_id, current)
-        self.entity_to_archetype[entity_id] = new_archetype
-        current[comp_type].add(entity_id, initial_data)
-        self._invalidate_query_cache()
+        comp_instance = self.get_component_instance(comp_type)
+        new_archetype = old_archetype.add_edges.get(comp_type)
+        if new_archetype is None:
+            bit = self.component_registry.get_bit(comp_type)
+            new_archetype = self._get_archetype(old_archetype.signature | bit)
+            old_archetype.add_edges[comp_type] = new_archetype
+            new_archetype.remove_edges[comp_type] = old_archetype
+        self._migrate_entity(entity_id, new_archetype)
+        comp_instance.add(entity_id, initial_data)
 
     def remove_component(self, entity_id: int, comp_type: Type[Component]) -> None:
         """Remove a component from an entity.
 
-        This action invalidates the query cache and updates the entity's archetype.
+        This action updates the entity's archetype.
 
         Args:
             entity_id (int): the entity to add the component to
             comp_type (Type[Component]): the type of the component to be removed
         """
-        current = self.entity_components.get(entity_id)
-        if current is None:
+        slots = self._entity_slot
+        slot = slots[entity_id] if 0 <= entity_id < len(slots) else -1
+        if slot == -1:
             raise ValueError("Entity does not exist.")
-        if comp_type not in current:
+        old_archetype = self._archetype_list[slot >> 32]
+        if comp_type not in old_archetype.storage:
             return
-        old_archetype = self.entity_to_archetype[entity_id]
-        old_archetype.remove_entity(entity_id)
-        current.pop(comp_type)
-        self.entity_components[entity_id] = current
-        new_signature = self.component_registry.compute_signature(list(current.keys()))
-        new_archetype = self._get_archetype(new_signature)
-        new_archetype.add_entity(entity_id, current)
-        self.entity_to_archetype[entity_id] = new_archetype
+        new_archetype = old_archetype.remove_edges.get(comp_type)
+        if new_archetype is None:
+            bit = self.component_registry.get_bit(comp_type)
+            new_archetype = self._get_archetype(old_archetype.signature & ~bit)
+            old_archetype.remove_edges[comp_type] = new_archetype
+            new_archetype.add_edges[comp_type] = old_archetype
+        self._migrate_entity(entity_id, new_archetype)
         comp_instance = self.get_component_instance(comp_type)
         comp_instance.remove(entity_id)
-        self._invalidate_query_cache()
+
+    def _migrate_entity(self, entity_id: int, new_archetype: Archetype) -> None:
+        """Move an entity to the given archetype.
+
+        Swap-pops the entity out of its old archetype (updating the slot of the
+        entity swapped into its place) and inserts it into the target
+        archetype. Callers resolve the target through the archetype graph
+        edges (or _get_archetype on a cache miss).
+        """
+        slots = self._entity_slot
+        slot = slots[entity_id]
+        old_archetype = self._archetype_list[slot >> 32]
+        moved_entity = old_archetype.remove_entity_at(slot & _SLOT_INDEX_MASK)
+        slots[moved_entity] = slot
+        index = new_archetype.add_entity(entity_id, new_archetype.storage)
+        slots[entity_id] = (new_archetype.archetype_id << 32) | index
+
+    def add_component_deferred(
+        self,
+        entity_id: int,
+        comp_type: Type[Component],
+        initial_data: Optional[Union[Tuple[Number, ...], Number]] = None,
+    ) -> None:
+        """Queue an add_component to be applied at the next flush_commands().
+
+        Structural changes (archetype moves) performed while a system iterates
+        query results mutate the entity lists being iterated. Systems should
+        queue the change instead; the world flushes the buffer once per
+        update(), after all systems have run.
+
+        Args:
+            entity_id (int): the entity to add the component to
+            comp_type (Type[Component]): the type of the component to be added
+            initial_data: tuple with initial data for the component (see
+                add_component).
+        """
+        self._pending_commands.append(
+            (self.add_component, entity_id, comp_type, initial_data)
+        )
+
+    def remove_component_deferred(
+        self, entity_id: int, comp_type: Type[Component]
+    ) -> None:
+        """Queue a remove_component to be applied at the next flush_commands().
+
+        Args:
+            entity_id (int): the entity to remove the component from
+            comp_type (Type[Component]): the type of the component to be removed
+        """
+        self._pending_commands.append((self.remove_component, entity_id, comp_type))
+
+    def remove_entity_deferred(self, entity_id: int) -> None:
+        """Queue a remove_entity to be applied at the next flush_commands().
+
+        Args:
+            entity_id (int): the id of the entity to be removed
+        """
+        self._pending_commands.append((self.remove_entity, entity_id))
+
+    def flush_commands(self) -> None:
+        """Apply all queued structural changes in the order they were queued.
+
+        Commands targeting entities that were removed by an earlier command in
+        the same batch are skipped silently - deferral makes that race
+        unavoidable, and dropping the stale command is the useful behavior.
+        """
+        pending = self._pending_commands
+        if not pending:
+            return
+        self._pending_commands = []
+        slots = self._entity_slot
+        for op, entity_id, *args in pending:
+            if not 0 <= entity_id < len(slots) or slots[entity_id] == -1:
+                continue
+            op(entity_id, *args)
+
+    def query_archetypes(
+        self, required_comp_types: List[Type[Component]]
+    ) -> List[Tuple[List[int], _CompDataT]]:
+        """Query matching archetypes without materializing per-entity rows.
+
+        Returns one tuple per matching archetype: the archetype's entity id list
+        and a single {type: instance} dict shared by all result tuples (the
+        world keeps one component instance per type, so the dict is identical
+        for every matching archetype and is built once per call).
+
+        Systems that operate on whole component arrays should prefer this over
+        query() - it does no per-entity work at all.
+
+        Args:
+            required_comp_types (List[Type[Component]]): list of component types.
+                each matched archetype contains at least all of these components.
+
+        Returns:
+            list of tuples:
+                entities (List[int]): the entity ids stored in the archetype
+                components data (Dict): dictionary of {type: instance} for the
+                    required components
+        """
+        # Instances are per-type, not per-archetype - hoist the dict build out
+        # of the archetype loop and share it across all result tuples.
+        # get_component_instance (not a bare registry lookup) so querying a
+        # type before its first entity exists auto-registers it and matches
+        # empty, like the other query entry points.
+        comp_data: _CompDataT = {
+            comp_type: self.get_component_instance(comp_type)
+            for comp_type in required_comp_types
+        }
+        results: List[Tuple[List[int], _CompDataT]] = []
+        for archetype in self._matching_archetypes(required_comp_types):
+            if archetype.entities:
+                results.append((archetype.entities, comp_data))
+        return results
+
+    def query_rows(
+        self, required_comp_types: List[Type[Component]]
+    ) -> List[Tuple[np.ndarray, Dict[Type[Component], np.ndarray]]]:
+        """Vectorized query: entity ids and component row indices as arrays.
+
+        Returns one tuple per matching archetype: the archetype's entity ids
+        as an ndarray and, for each required component, the rows those
+        entities occupy in the component's dense array. Systems can then
+        gather/scatter whole batches with fancy indexing instead of per-entity
+        Python loops::
+
+            for ids, rows in world.query_rows([Position, Velocity]):
+                pos.array.a[rows[Position]] += vel.array.a[rows[Velocity]] * dt
+
+        Args:
+            required_comp_types (List[Type[Component]]): list of component
+                types. each matched archetype contains at least all of them.
+
+        Returns:
+            list of (entity_ids, {type: row_indices}) tuples, one per
+            matching archetype
+        """
+        components = self.component_registry.components
+        results: List[Tuple[np.ndarray, Dict[Type[Component], np.ndarray]]] = []
+        for archetype in self._matching_archetypes(required_comp_types):
+            entities = archetype.entities
+            if not entities:
+                continue
+            ids = np.asarray(entities, dtype=np.intp)
+            rows: Dict[Type[Component], np.ndarray] = {}
+            for comp_type in required_comp_types:
+                comp_instance = components[comp_type]
+                if comp_instance.dimensions == 0:
+                    # Tags carry no data rows - they only constrain matching.
+                    continue
+                rows[comp_type] = comp_instance.rows_of(ids)
+            results.append((ids, rows))
+        return results
+
+    def query_ids(
+        self, required_comp_types: List[Type[Component]]
+    ) -> np.ndarray:
+        """Return only the ids of the matching entities, as one ndarray.
+
+        The leanest query shape: no per-entity dicts and no row translation.
+        Useful when the caller just needs the population (counts, deferred
+        removals) or will translate ids itself via Component.rows_of.
+
+        Args:
+            required_comp_types (List[Type[Component]]): list of component
+                types. each returned entity has at least all of them.
+
+        Returns:
+            ndarray of entity ids, concatenated across matching archetypes
+        """
+        id_lists = [
+            archetype.entities
+            for archetype in self._matching_archetypes(required_comp_types)
+            if archetype.entities
+        ]
+        if not id_lists:
+            return np.empty(0, dtype=np.intp)
+        if len(id_lists) == 1:
+            return np.asarray(id_lists[0], dtype=np.intp)
+        return np.concatenate(
+            [np.asarray(ids, dtype=np.intp) for ids in id_lists]
+        )
+
+    def _matching_archetypes(
+        self, required_comp_types: List[Type[Component]]
+    ) -> List[Archetype]:
+        """Return the archetypes whose signature contains all the required bits.
+
+        The result is cached per query mask - archetype membership depends only
+        on the component set, so the cached list stays valid under entity churn
+        and is extended by _get_archetype when a new archetype appears.
+
+        On a cache miss the list is built from the per-bit inverted index: the
+        smallest candidate set is intersected with the others, so the work is
+        proportional to the number of matching archetypes rather than to the
+        total archetype count.
+        """
+        registry = self.component_registry
+        bits = registry._component_bits
+        key = tuple(required_comp_types)
+        query_mask = self._query_masks.get(key)
+        if query_mask is None:
+            query_mask = 0
+            for comp_type in key:
+                bit = bits.get(comp_type)
+                if bit is None:
+                    bit = registry.get_bit(comp_type)
+                query_mask |= bit
+            self._query_masks[key] = query_mask
+        matched = self._mask_to_archetypes.get(query_mask)
+        if matched is not None:
+            return matched
+        if query_mask == 0:
+            matched = list(self.archetypes.values())
+        else:
+            candidate_sets = []
+            for comp_type in required_comp_types:
+                candidates = self._archetypes_by_bit.get(bits[comp_type])
+                if not candidates:
+                    candidate_sets = None
+                    break
+                candidate_sets.append(candidates)
+            if candidate_sets is None:
+                matched = []
+            else:
+                candidate_sets.sort(key=len)
+                matched = list(
+                    candidate_sets[0].intersection(*candidate_sets[1:])
+                )
+        self._mask_to_archetypes[query_mask] = matched
+        return matched
 
     def query(
         self, required_comp_types: List[Type[Component]]
@@ -310,7 +787,12 @@ class World:
         Returns a list of tuples, each containing an entity id and a dict mapping
         component types to their instances.
 
-        Query results are cached until the world changes (entity removed/modified).
+        The matching archetypes are cached per query mask; the per-entity rows
+        are rebuilt from their entity lists on every call, so results always
+        reflect the current world state.
+
+        This is a convenience adapter over query_archetypes() that flattens the
+        per-archetype results into per-entity rows.
 
         Args:
             required_comp_types (List[Type[Component]]): list of component. each queried
@@ -322,27 +804,61 @@ class World:
                 components data (Dict): dictionary of {type: instance} for all the
                     components of the entity
         """
-        query_mask = 0
-        for comp_type in required_comp_types:
-            query_mask |= self.component_registry.get_bit(comp_type)
-        cache_entry = self.query_cache.get(query_mask)
-        if cache_entry is not None:
-            cached_result, version = cache_entry
-            if version == self.world_version:
-                return cached_result
-
         results: List[Tuple[int, _CompDataT]] = []
-        for archetype in self.archetypes.values():
-            if (archetype.signature & query_mask) == query_mask:
-                for idx in range(len(archetype.entities)):
-                    entity_id = archetype.entities[idx]
-                    entity_data: _CompDataT = {}
-                    for comp_type in required_comp_types:
-                        entity_data[comp_type] = archetype.storage[comp_type][idx]
-                    results.append((entity_id, entity_data))
-        self.query_cache[query_mask] = (results, self.world_version)
+        append = results.append
+        for entities, comp_data in self.query_archetypes(required_comp_types):
+            # The {type: instance} dict is shared per archetype; a flat dict
+            # copy per entity replaces the old per-entity storage lookups.
+            copy = comp_data.copy
+            for entity_id in entities:
+                append((entity_id, copy()))
         return results
 
+    def compiled_query(
+        self, required_comp_types: Tuple[Type[Component], ...]
+    ) -> Callable[[], List[Tuple[int, _CompDataT]]]:
+        """Return a generated zero-argument function specialized for this query.
+
+        For a query issued every frame, even the adapter loop in query() pays
+        per-call overhead: mask computation, cache lookups, and a dict copy per
+        entity. The generated function hardcodes the component types and their
+        (stable) instances as dict-literal constants and closes over the live
+        per-mask archetype list, so calling it does nothing but walk entity
+        lists and build result tuples. The archetype list is the same object
+        extended by _get_archetype, so new archetypes are picked up without
+        recompilation.
+
+        Args:
+            required_comp_types: tuple of component types (hashable - used as
+                the cache key). Lists are accepted and converted.
+
+        Returns:
+            a callable returning the same rows as query(required_comp_types)
+        """
+        key = tuple(required_comp_types)
+        query_fn = self._compiled_queries.get(key)
+        if query_fn is not None:
+            return query_fn
+        matched = self._matching_archetypes(list(key))
+        items = ", ".join(f"_t{i}: _i{i}" for i in range(len(key)))
+        src = (
+            "def _q():\n"
+            "    results = []\n"
+            "    append = results.append\n"
+            "    for _archetype in _matched:\n"
+            "        for _eid in _archetype.entities:\n"
+            f"            append((_eid, {{{items}}}))\n"
+            "    return results\n"
+        )
+        namespace = {"_matched": matched}
+        for i, comp_type in enumerate(key):
+            namespace[f"_t{i}"] = comp_type
+            namespace[f"_i{i}"] = self.get_component_instance(comp_type)
+        exec(src, namespace)
+        query_fn = namespace["_q"]
+        self._compiled_queries[key] = query_fn
+        return query_fn
+
     def update_systems(self, dt: float, group: Optional[str] = None) -> None:
         """Update the systems in the world
 
@@ -356,14 +872,19 @@ class World:
                 `system.group == group` will be updated.
                 If None - update all systems.
         """
-        for system in self.systems:
-            if system.enabled and (group is None or system.group == group):
+        if group is None:
+            systems = self.systems
+        else:
+            systems = self._systems_by_group.get(group, ())
+        for system in systems:
+            if system.enabled:
                 system.update(self, dt)
 
     def update(self, dt: float, group: Optional[str] = None) -> None:
         """Update the world
 
-        Calls the update() method of each registered system and of the event bus.
+        Calls the update() method of each registered system, flushes any
+        structural changes the systems queued, and updates the event bus.
         If a system is disabled - skip the update.
         Optionally - choose a specific group of systems and only update them
 
@@ -375,4 +896,5 @@ class World:
         """
 
         self.update_systems(dt, group)
+        self.flush_commands()
         self.event_bus.update()
@@ -1,16 +1,18 @@
 # Tests Generated with ChatGPT
 # TODO - improve tests, test edge cases
 
-from ecs.component import Component
+import numpy as np
+
+from ecs.component import Component, TagComponent
 from ecs.array_wrapper import ArrayWrapper
 from ecs.component import ComponentRegistry
 
 
 # A dummy component subclass for testing.
 class DummyComponent(Component):
-    @property
-    def dimensions(self) -> int:
-        return 2
+    __slots__ = ()
+
+    dimensions = 2
 
 
 # ----------------------- Component Tests -----------------------
@@ -24,6 +26,8 @@ def test_component_initialization():
     assert isinstance(comp.array, ArrayWrapper)
     # Check that size is initially 0.
     assert comp.size == 0
+    # Default storage dtype is float32.
+    assert comp.array.a.dtype == np.float32
     # Check default value.
     assert comp._default == (0, 0)
 
@@ -32,7 +36,8 @@ def test_component_add_and_get_value():
     comp = DummyComponent()
     # Add a new entity.
     comp.add(1, (10, 20))
-    idx = comp.entity_to_index[1]
+    idx = comp.index_of(1)
+    assert idx >= 0
     # Ensure that value is stored correctly.
     val = comp.get_value(1)
     assert val == (10, 20)
@@ -47,6 +52,36 @@ def test_component_update_value():
     assert comp.get_value(1) == (100, 200)
 
 
+def test_component_update_values_batch():
+    comp = DummyComponent()
+    comp.add_many([1, 2, 3], [(0, 0), (1, 1), (2, 2)])
+    comp.update_values([3, 1], np.array([(30, 31), (10, 11)]))
+    assert comp.get_value(3) == (30, 31)
+    assert comp.get_value(1) == (10, 11)
+    assert comp.get_value(2) == (1, 1)
+    # A single row broadcasts across the batch.
+    comp.update_values([1, 2], (5, 5))
+    assert comp.get_value(1) == (5, 5)
+    assert comp.get_value(2) == (5, 5)
+
+
+def test_component_single_column_growth():
+    class OneD(Component):
+        __slots__ = ()
+
+        dimensions = 1
+
+    comp = OneD()
+    # Grow past initial_capacity; single-column sole-owner buffers take the
+    # in-place resize fast path, others copy - either way data survives and
+    # the raw alias tracks the wrapper.
+    for i in range(comp.initial_capacity + 2):
+        comp.add(i, (float(i),))
+    assert comp._raw is comp.array.a
+    for i in range(comp.initial_capacity + 2):
+        assert comp.get_value(i) == (i,)
+
+
 def test_component_resize_and_reference_stability():
     comp = DummyComponent()
     initial_ref = comp.array
@@ -61,6 +96,35 @@ def test_component_resize_and_reference_stability():
     assert comp.get_value(4) == (7, 8)
 
 
+def test_component_column_access():
+    comp = DummyComponent()
+    comp.add(1, (10, 20))
+    comp.add(2, (30, 40))
+    # Columns are contiguous 1d views (SoA layout) and write through.
+    col_x = comp.column(0)
+    assert col_x.flags.c_contiguous
+    assert col_x[0] == 10 and col_x[1] == 30
+    col_x[1] = 99
+    assert comp.get_value(2) == (99, 40)
+    # Layout survives a resize.
+    comp.add(3, (1, 2))
+    comp.add(4, (3, 4))
+    assert comp.column(1).flags.c_contiguous
+
+
+def test_component_active_rows():
+    comp = DummyComponent()
+    comp.add(1, (1, 2))
+    comp.add(2, (3, 4))
+    comp.add(3, (5, 6))
+    comp.remove(1)
+    dense = comp.active()
+    # The dense block covers exactly the live rows, with no gaps.
+    assert dense.shape == (2, 2)
+    rows = {tuple(row) for row in dense}
+    assert rows == {(3, 4), (5, 6)}
+
+
 def test_component_remove_and_free_slot():
     comp = DummyComponent()
     comp.add(1, (10, 20))
@@ -73,24 +137,158 @@ def test_component_remove_and_free_slot():
     assert len(freed_indices) >= 1
     # Now add a new entity; it should reuse a free slot.
     comp.add(4, (70, 80))
-    reused_index = comp.entity_to_index[4]
+    reused_index = comp.index_of(4)
     assert reused_index in freed_indices or reused_index < comp.size
     assert comp.get_value(4) == (70, 80)
 
 
+def test_component_shrink_on_low_occupancy():
+    comp = DummyComponent()
+    comp.add_many(list(range(40)), [(i, i) for i in range(40)])
+    peak_capacity = comp._capacity
+    assert peak_capacity >= 40
+    comp.remove_many(list(range(1, 40)))
+    # Occupancy fell below the threshold - capacity should have been released.
+    assert comp._capacity < peak_capacity
+    # The surviving entity is intact and new adds still work.
+    assert comp.get_value(0) == (0, 0)
+    comp.add(100, (5, 6))
+    assert comp.get_value(100) == (5, 6)
+
+
+class IntComponent(Component):
+    __slots__ = ()
+    dtype = np.int32
+
+    dimensions = 1
+
+
+def test_component_alive_bitset():
+    comp = DummyComponent()
+    assert not comp.has_entity(0)
+    comp.add(0, (1, 2))
+    comp.add(70, (3, 4))  # forces bitset growth past the first word
+    assert comp.has_entity(0)
+    assert comp.has_entity(70)
+    assert not comp.has_entity(1)
+    comp.remove(0)
+    assert not comp.has_entity(0)
+    assert comp.has_entity(70)
+    # ANDing two masks yields entities present in both components.
+    other = DummyComponent()
+    other.add(70, (0, 0))
+    n = min(comp.alive_mask.shape[0], other.alive_mask.shape[0])
+    both = comp.alive_mask[:n] & other.alive_mask[:n]
+    assert both[70 >> 6] & np.uint64(1 << (70 & 63))
+
+
+def test_component_entities_with():
+    a = DummyComponent()
+    b = DummyComponent()
+    for entity_id in (0, 3, 70, 100):
+        a.add(entity_id, (1, 1))
+    for entity_id in (3, 70, 101):
+        b.add(entity_id, (2, 2))
+    np.testing.assert_array_equal(a.entities_with(b), [3, 70])
+    # Single-component form lists the component's own entities.
+    np.testing.assert_array_equal(a.entities_with(), [0, 3, 70, 100])
+
+
+def test_component_custom_dtype():
+    comp = IntComponent()
+    assert comp.array.a.dtype == np.int32
+    comp.add(1, (5,))
+    assert comp.get_value(1) == (5,)
+    # Growth preserves the dtype.
+    for i in range(2, 8):
+        comp.add(i, (i,))
+    assert comp.array.a.dtype == np.int32
+    assert comp.get_value(7) == (7,)
+
+
+def test_component_add_many():
+    comp = DummyComponent()
+    comp.add_many([1, 2, 3, 4], [(1, 2), (3, 4), (5, 6), (7, 8)])
+    assert comp.size == 4
+    assert comp.get_value(1) == (1, 2)
+    assert comp.get_value(4) == (7, 8)
+    # Broadcast a single row to all entities.
+    comp.add_many([5, 6], (9, 9))
+    assert comp.get_value(5) == (9, 9)
+    assert comp.get_value(6) == (9, 9)
+
+
+def test_component_remove_many():
+    comp = DummyComponent()
+    comp.add_many([1, 2, 3, 4, 5], [(i, i) for i in range(5)])
+    comp.remove_many([2, 4, 99])
+    assert comp.size == 3
+    assert comp.index_of(2) == -1
+    assert comp.index_of(4) == -1
+    # Survivors keep their data and stay within the dense region.
+    for entity_id in (1, 3, 5):
+        assert 0 <= comp.index_of(entity_id) < comp.size
+    assert comp.get_value(3) == (2, 2)
+    assert comp.get_value(5) == (4, 4)
+    # Freed slots are reusable by subsequent adds.
+    comp.add(6, (7, 7))
+    assert comp.get_value(6) == (7, 7)
+
+
+def test_component_index_to_entity():
+    comp = DummyComponent()
+    comp.add_many([1, 2, 3, 4], [(i, i) for i in range(4)])
+    # Reverse map mirrors the sparse index over the dense region.
+    assert comp.index_to_entity == [1, 2, 3, 4]
+    comp.remove(2)  # swap-remove moves entity 4 into row 1
+    assert comp.index_to_entity == [1, 4, 3]
+    assert comp.index_of(4) == 1
+    comp.remove_many([1, 3])
+    assert comp.index_to_entity == [4]
+    comp.add(5, (9, 9))
+    assert comp.index_to_entity == [4, 5]
+    assert all(
+        comp.index_of(ent) == idx for idx, ent in enumerate(comp.index_to_entity)
+    )
+    # Batch id-to-row translation via the sparse array.
+    np.testing.assert_array_equal(comp.rows_of([5, 4]), [1, 0])
+
+
+class MarkerTag(TagComponent):
+    __slots__ = ()
+
+
+def test_tag_component():
+    tag = MarkerTag()
+    tag.add(3)
+    tag.add(70, (1,))  # data is ignored
+    assert tag.has_entity(3)
+    assert tag.has_entity(70)
+    assert not tag.has_entity(4)
+    # No per-entity bookkeeping is allocated.
+    assert tag.index_to_entity == []
+    assert tag.size == 0
+    tag.remove(3)
+    assert not tag.has_entity(3)
+    # Tags still participate in bitset joins.
+    comp = DummyComponent()
+    comp.add(70, (1, 2))
+    np.testing.assert_array_equal(comp.entities_with(tag), [70])
+
+
 # --------------------- ComponentRegistry Tests ---------------------
 
 
 class DummyA(Component):
-    @property
-    def dimensions(self) -> int:
-        return 2
+    __slots__ = ()
+
+    dimensions = 2
 
 
 class DummyB(Component):
-    @property
-    def dimensions(self) -> int:
-        return 1
+    __slots__ = ()
+
+    dimensions = 1
 
 
 def test_registry_get_bit():
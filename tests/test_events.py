@@ -68,6 +68,31 @@ def test_double_buffering():
     assert handler.event_value == 3
 
 
+def test_codegen_dispatch_multiple_types():
+    class OtherEvent(Event):
+        def __init__(self, value):
+            self.value = value
+
+    bus = EventBus()
+    handler_a = DummyHandler()
+    handler_b = DummyHandler()
+    bus.subscribe(DummyEvent, handler_a.handle)
+    bus.subscribe(OtherEvent, handler_b.handle)
+    bus.publish_async(DummyEvent(1))
+    bus.publish_async(OtherEvent(2))
+    bus.update()
+    assert handler_a.event_value == 1
+    assert handler_b.event_value == 2
+    # Unsubscribing invalidates and rebuilds the specialized dispatcher.
+    bus.unsubscribe(DummyEvent, handler_a.handle)
+    handler_a.called = False
+    bus.publish_async(DummyEvent(3))
+    bus.publish_async(OtherEvent(4))
+    bus.update()
+    assert not handler_a.called
+    assert handler_b.event_value == 4
+
+
 def test_lambda_subscription():
     bus = EventBus()
     # Lambdas won't work reliably with weak references.
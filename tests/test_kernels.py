@@ -0,0 +1,44 @@
+import numpy as np
+
+from ecs import kernels
+
+
+def test_integrate():
+    pos = np.array([[0.0, 0.0], [1.0, 1.0]])
+    vel = np.array([[1.0, 2.0], [3.0, 4.0]])
+    kernels.integrate(pos, vel, 0.5)
+    np.testing.assert_allclose(pos, [[0.5, 1.0], [2.5, 3.0]])
+
+
+def test_integrate_accel():
+    pos = np.zeros((2, 2))
+    vel = np.ones((2, 2))
+    acc = np.full((2, 2), 2.0)
+    kernels.integrate_accel(pos, vel, acc, 1.0)
+    np.testing.assert_allclose(vel, np.full((2, 2), 3.0))
+    np.testing.assert_allclose(pos, np.full((2, 2), 3.0))
+
+
+def test_integrate_rows():
+    pos = np.zeros((4, 2))
+    vel = np.ones((4, 2))
+    rows = np.array([0, 2], dtype=np.intp)
+    kernels.integrate_rows(pos, vel, rows, 0.5)
+    np.testing.assert_allclose(pos[[0, 2]], np.full((2, 2), 0.5))
+    np.testing.assert_allclose(pos[[1, 3]], np.zeros((2, 2)))
+
+
+def test_warmup_runs():
+    kernels.warmup()
+
+
+def test_kernel_decorator():
+    @kernels.kernel
+    def scale(arr, factor):
+        for i in kernels.prange(arr.shape[0]):
+            for d in range(arr.shape[1]):
+                arr[i, d] *= factor
+
+    arr = np.arange(6, dtype=np.float64).reshape(3, 2)
+    scale(arr, 2.0)
+    np.testing.assert_allclose(arr, np.arange(6, dtype=np.float64).reshape(3, 2) * 2)
@@ -11,15 +11,15 @@ from ecs.system import System
 
 # Dummy components for testing.
 class DummyA(Component):
-    @property
-    def dimensions(self) -> int:
-        return 2
+    __slots__ = ()
+
+    dimensions = 2
 
 
 class DummyB(Component):
-    @property
-    def dimensions(self) -> int:
-        return 1
+    __slots__ = ()
+
+    dimensions = 1
 
 
 # Dummy system that records update calls.
@@ -43,9 +43,9 @@ def test_create_entity():
     entity_id = world.create_entity(
         [DummyA, DummyB], component_initial_data={DummyA: (10, 20), DummyB: (30,)}
     )
-    # Check that the entity mapping exists.
-    assert entity_id in world.entity_components
-    comp_map = world.entity_components[entity_id]
+    # Check that the entity exists and has both components.
+    assert world.entity_exists(entity_id)
+    comp_map = world.components_of(entity_id)
     assert DummyA in comp_map
     assert DummyB in comp_map
 
@@ -58,8 +58,8 @@ def test_create_entity():
     # Verify stored values using the component instances.
     compA = world.get_component_instance(DummyA)
     compB = world.get_component_instance(DummyB)
-    idxA = compA.entity_to_index.get(entity_id)
-    idxB = compB.entity_to_index.get(entity_id)
+    idxA = compA.index_of(entity_id)
+    idxB = compB.index_of(entity_id)
     np.testing.assert_array_equal(compA.array[idxA], np.array((10, 20)))
     np.testing.assert_array_equal(compB.array[idxB], np.array((30,)))
 
@@ -68,26 +68,52 @@ def test_remove_entity():
     world = World()
     world.register_component(DummyA)
     entity_id = world.create_entity([DummyA], component_initial_data={DummyA: (5, 6)})
-    assert entity_id in world.entity_components
+    assert world.entity_exists(entity_id)
     world.remove_entity(entity_id)
-    assert entity_id not in world.entity_components
+    assert not world.entity_exists(entity_id)
     assert entity_id in world.free_ids
 
 
+def test_remove_entities_batch():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    ids = world.spawn_batch(
+        [DummyA, DummyB],
+        5,
+        component_initial_data={DummyA: [(i, i) for i in range(5)], DummyB: (1,)},
+    )
+    solo = world.create_entity([DummyA], component_initial_data={DummyA: (9, 9)})
+    # Removals spanning two archetypes go through in one call.
+    world.remove_entities([ids[0], ids[3], solo])
+    assert world.num_entities == 3
+    for entity_id in (ids[0], ids[3], solo):
+        assert not world.entity_exists(entity_id)
+        assert entity_id in world.free_ids
+    # Survivors keep their data and stay queryable after the compaction.
+    compA = world.get_component_instance(DummyA)
+    assert compA.get_value(ids[1]) == (1, 1)
+    assert compA.get_value(ids[4]) == (4, 4)
+    assert sorted(world.query_ids([DummyA])) == sorted([ids[1], ids[2], ids[4]])
+    assert sorted(world.query_ids([DummyA, DummyB])) == sorted(
+        [ids[1], ids[2], ids[4]]
+    )
+
+
 def test_add_remove_component():
     world = World()
     world.register_component(DummyA)
     world.register_component(DummyB)
     entity_id = world.create_entity([DummyA], component_initial_data={DummyA: (1, 2)})
-    comp_map = world.entity_components[entity_id]
+    comp_map = world.components_of(entity_id)
     assert DummyA in comp_map
     # Add DummyB.
     world.add_component(entity_id, DummyB, (3,))
-    comp_map = world.entity_components[entity_id]
+    comp_map = world.components_of(entity_id)
     assert DummyB in comp_map
     # Remove DummyA.
     world.remove_component(entity_id, DummyA)
-    comp_map = world.entity_components[entity_id]
+    comp_map = world.components_of(entity_id)
     assert DummyA not in comp_map
 
 
@@ -105,6 +131,134 @@ def test_query_cache_invalidation():
     assert len(results2) == 0
 
 
+def test_query_archetypes():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    e1 = world.create_entity([DummyA, DummyB])
+    e2 = world.create_entity([DummyA, DummyB])
+    e3 = world.create_entity([DummyA])
+    results = world.query_archetypes([DummyA])
+    # One tuple per matching archetype, entities grouped together.
+    assert len(results) == 2
+    all_entities = sorted(eid for entities, _ in results for eid in entities)
+    assert all_entities == sorted([e1, e2, e3])
+    for entities, comp_data in results:
+        assert comp_data[DummyA] is world.get_component_instance(DummyA)
+    # Requiring both components matches only the two-component archetype.
+    results_ab = world.query_archetypes([DummyA, DummyB])
+    assert len(results_ab) == 1
+    assert sorted(results_ab[0][0]) == sorted([e1, e2])
+
+
+def test_query_unused_component():
+    world = World()
+    # Querying a type no entity has ever carried auto-registers it and
+    # matches nothing instead of raising.
+    assert world.query([DummyA]) == []
+    assert world.query_archetypes([DummyA]) == []
+
+
+def test_query_rows():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    rows_in = [(i, i + 1) for i in range(4)]
+    ids = world.spawn_batch(
+        [DummyA, DummyB], 4, component_initial_data={DummyA: rows_in, DummyB: (0,)}
+    )
+    compA = world.get_component_instance(DummyA)
+    results = world.query_rows([DummyA, DummyB])
+    assert len(results) == 1
+    entity_ids, rows = results[0]
+    np.testing.assert_array_equal(entity_ids, ids)
+    # Row indices address the component's dense array for those entities.
+    np.testing.assert_array_equal(
+        compA.array.a[rows[DummyA]], np.asarray(rows_in, dtype=np.float32)
+    )
+    # Scatter-writes through the row indices hit the right entities.
+    compA.array.a[rows[DummyA]] += 10
+    assert compA.get_value(ids[0]) == (10, 11)
+
+
+def test_query_ids():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    e1 = world.create_entity([DummyA, DummyB])
+    e2 = world.create_entity([DummyA])
+    e3 = world.create_entity([DummyA, DummyB])
+    assert sorted(world.query_ids([DummyA])) == sorted([e1, e2, e3])
+    assert sorted(world.query_ids([DummyA, DummyB])) == sorted([e1, e3])
+    ids = world.query_ids([DummyB])
+    assert ids.dtype == np.intp
+    # No matches yields an empty array, not an error.
+    world.remove_entity(e1)
+    world.remove_entity(e3)
+    assert world.query_ids([DummyB]).size == 0
+
+
+def test_spawn_batch():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    rows = [(i, i * 2) for i in range(5)]
+    ids = world.spawn_batch(
+        [DummyA, DummyB], 5, component_initial_data={DummyA: rows, DummyB: (9,)}
+    )
+    assert len(ids) == 5
+    assert world.num_entities == 5
+    compA = world.get_component_instance(DummyA)
+    compB = world.get_component_instance(DummyB)
+    for i, entity_id in enumerate(ids):
+        assert compA.get_value(entity_id) == rows[i]
+        assert compB.get_value(entity_id) == (9,)
+    # Batch-created entities behave like any other.
+    assert len(world.query([DummyA, DummyB])) == 5
+    world.remove_entity(ids[2])
+    assert len(world.query([DummyA, DummyB])) == 4
+
+
+def test_compiled_query():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    e1 = world.create_entity([DummyA, DummyB])
+    query_ab = world.compiled_query((DummyA, DummyB))
+    # Same callable is returned for the same type tuple.
+    assert world.compiled_query((DummyA, DummyB)) is query_ab
+    results = query_ab()
+    assert results == world.query([DummyA, DummyB])
+    assert results[0][0] == e1
+    # Entities (and archetypes) created after compilation are picked up.
+    e2 = world.create_entity([DummyA, DummyB])
+    e3 = world.create_entity([DummyA])
+    query_a = world.compiled_query((DummyA,))
+    assert sorted(eid for eid, _ in query_ab()) == sorted([e1, e2])
+    assert sorted(eid for eid, _ in query_a()) == sorted([e1, e2, e3])
+
+
+def test_deferred_commands():
+    world = World()
+    world.register_component(DummyA)
+    world.register_component(DummyB)
+    e1 = world.create_entity([DummyA], component_initial_data={DummyA: (1, 2)})
+    e2 = world.create_entity([DummyA], component_initial_data={DummyA: (3, 4)})
+    world.add_component_deferred(e1, DummyB, (5,))
+    world.remove_entity_deferred(e2)
+    # Queued commands are not applied until flush.
+    assert DummyB not in world.components_of(e1)
+    assert world.entity_exists(e2)
+    world.flush_commands()
+    assert DummyB in world.components_of(e1)
+    assert not world.entity_exists(e2)
+    # Commands for an entity removed earlier in the batch are dropped.
+    world.remove_entity_deferred(e1)
+    world.remove_component_deferred(e1, DummyB)
+    world.flush_commands()
+    assert not world.entity_exists(e1)
+
+
 def test_update_systems():
     world = World()
     dummy = DummySystem()